@@ -1,3 +1,6 @@
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from determined.cli._util import (
     output_format_args,
     make_pagination_args,
@@ -7,24 +10,59 @@ from determined.cli._util import (
     login_sdk_client,
     print_warnings,
 )
-from determined.cli import (
-    agent,
-    checkpoint,
-    cli,
-    command,
-    experiment,
-    master,
-    model,
-    notebook,
-    project,
-    rbac,
-    remote,
-    render,
-    resources,
-    shell,
-    template,
-    tensorboard,
-    trial,
-    user,
-    workspace,
-)
+
+# Command modules are imported on first access, so that importing one of them (or the helpers
+# above) doesn't pay for importing all of the others.
+_LAZY_SUBMODULES = {
+    "agent",
+    "checkpoint",
+    "cli",
+    "command",
+    "experiment",
+    "master",
+    "model",
+    "notebook",
+    "project",
+    "rbac",
+    "remote",
+    "render",
+    "resources",
+    "shell",
+    "template",
+    "tensorboard",
+    "trial",
+    "user",
+    "workspace",
+}
+
+
+if TYPE_CHECKING:
+    # Let type checkers see the real submodules; a module-level __getattr__ would otherwise make
+    # every attribute of determined.cli type-check as Any.
+    from determined.cli import (
+        agent,
+        checkpoint,
+        cli,
+        command,
+        experiment,
+        master,
+        model,
+        notebook,
+        project,
+        rbac,
+        remote,
+        render,
+        resources,
+        shell,
+        template,
+        tensorboard,
+        trial,
+        user,
+        workspace,
+    )
+else:
+
+    def __getattr__(name: str) -> Any:
+        if name in _LAZY_SUBMODULES:
+            return importlib.import_module(f"determined.cli.{name}")
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
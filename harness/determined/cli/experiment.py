@@ -1,5 +1,4 @@
 import base64
-import distutils.util
 import json
 import numbers
 import pathlib
@@ -1152,7 +1151,7 @@ main_cmd = Cmd(
                 ),
                 Arg(
                     "--smaller-is-better",
-                    type=lambda s: bool(distutils.util.strtobool(s)),
+                    type=util.strtobool,
                     default=None,
                     help="The sort order for metrics when using --sort-by. For "
                     "example, 'accuracy' would require passing '--smaller-is-better false'. If "
@@ -1,43 +1,62 @@
-import distutils.util
+import concurrent.futures
+import io
 import json
+import operator
 import os
+import sys
 import tarfile
 import tempfile
+import threading
+import time
 from argparse import Namespace
 from datetime import datetime
-from typing import Any, List, Optional, Sequence, Tuple, Union
+from typing import IO, Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 from determined import cli
 from determined.cli import render
 from determined.cli.master import format_log_entry
-from determined.common import api, constants
+from determined.common import api, constants, util
 from determined.common.api import authentication, bindings
 from determined.common.declarative_argparse import Arg, Cmd, Group
 from determined.common.experimental import Determined
 
 from .checkpoint import render_checkpoint
 
-
-def _workload_container_unpack(
-    container: bindings.v1WorkloadContainer,
-) -> Union[bindings.v1MetricsWorkload, bindings.v1CheckpointWorkload]:
-    result = container.training or container.validation or container.checkpoint
-    assert result is not None
-    return result
+BUNDLE_WRITE_BUFFER_SIZE = 2 * 1024 * 1024
+BUNDLE_SPOOL_MAX_SIZE = 64 * 1024 * 1024
+# Bundles are written once and rarely read; the fastest gzip level is plenty for text logs.
+BUNDLE_COMPRESSLEVEL = 1
 
 
 def _format_state(state: Union[bindings.checkpointv1State, bindings.experimentv1State]) -> str:
     return str(state.value).replace("STATE_", "")
 
 
-def _format_validation(validation: Optional[bindings.v1MetricsWorkload]) -> Optional[str]:
+def _pretty_json(obj: Any) -> str:
+    return json.dumps(obj, indent=4)
+
+
+def _compact_json(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def _json_formatter(csv: bool) -> Callable[[Any], str]:
+    # Indentation only helps readability in tables; keep CSV cells compact.
+    return _compact_json if csv else _pretty_json
+
+
+def _format_validation(
+    validation: Optional[bindings.v1MetricsWorkload], dumps: Callable[[Any], str] = _pretty_json
+) -> Optional[str]:
     if not validation:
         return None
 
-    return json.dumps(validation.metrics.to_json(), indent=4)
+    return dumps(validation.metrics.to_json())
 
 
-def _format_checkpoint(checkpoint: Optional[bindings.v1CheckpointWorkload]) -> List[Any]:
+def _format_checkpoint(
+    checkpoint: Optional[bindings.v1CheckpointWorkload], dumps: Callable[[Any], str] = _pretty_json
+) -> List[Any]:
     if not checkpoint:
         return [None, None, None]
 
@@ -46,16 +65,16 @@ def _format_checkpoint(checkpoint: Optional[bindings.v1CheckpointWorkload]) -> L
         return [
             state,
             checkpoint.uuid,
-            json.dumps(checkpoint.metadata, indent=4),
+            dumps(checkpoint.metadata),
         ]
     elif state in (constants.ACTIVE, constants.ERROR):
-        return [checkpoint.state, None, json.dumps(checkpoint.metadata, indent=4)]
+        return [checkpoint.state, None, dumps(checkpoint.metadata)]
     else:
         raise AssertionError("Invalid checkpoint state: {}".format(checkpoint.state))
 
 
 def _workloads_tabulate(
-    workloads: Sequence[bindings.v1WorkloadContainer], metrics: bool
+    workloads: Sequence[bindings.v1WorkloadContainer], metrics: bool, csv: bool = False
 ) -> Tuple[List[str], List[List[Any]]]:
     # Print information about individual steps.
     headers = [
@@ -67,30 +86,33 @@ def _workloads_tabulate(
         "Validation Metrics",
     ]
 
-    if metrics:
-        headers.append("Workload Metrics")
+    dumps = _json_formatter(csv)
+    format_time = render.format_time
+    # Fetch each row's fields with a single C-level call per object.
+    get_workloads = operator.attrgetter("training", "validation", "checkpoint")
+    get_fields = operator.attrgetter("totalBatches", "endTime")
 
     values = []
-
     for w in workloads:
-        w_unpacked = _workload_container_unpack(w)
-
-        row_metrics = []
-        if metrics:
-            metrics_workload = w.training or w.validation
-            if metrics_workload:
-                row_metrics = [json.dumps(metrics_workload.metrics.to_json(), indent=4)]
-
+        training, validation, checkpoint = get_workloads(w)
+        workload = training or validation or checkpoint
+        assert workload is not None
+        total_batches, end_time = get_fields(workload)
         values.append(
             [
-                w_unpacked.totalBatches,
-                render.format_time(w_unpacked.endTime),
-                *_format_checkpoint(w.checkpoint),
-                _format_validation(w.validation),
-                *row_metrics,
+                total_batches,
+                format_time(end_time),
+                *_format_checkpoint(checkpoint, dumps),
+                _format_validation(validation, dumps),
             ]
         )
 
+    if metrics:
+        headers.append("Workload Metrics")
+        for row, w in zip(values, workloads):
+            # Validation workloads report the same metrics in both columns.
+            row.append(dumps(w.training.metrics.to_json()) if w.training else row[-1])
+
     return headers, values
 
 
@@ -115,7 +137,9 @@ def describe_trial(args: Namespace) -> None:
     if args.json:
         data = trial_response.to_json()
         data["workloads"] = [w.to_json() for w in workloads]
-        print(json.dumps(data, indent=4))
+        # Workloads can be large; write them out as they are encoded rather than as one string.
+        json.dump(data, sys.stdout, indent=4)
+        print()
         return
 
     # Print information about the trial itself.
@@ -131,14 +155,14 @@ def describe_trial(args: Namespace) -> None:
         [
             trial.experimentId,
             trial.state,
-            json.dumps(trial.hparams, indent=4),
+            _json_formatter(args.csv)(trial.hparams),
             render.format_time(trial.startTime),
             render.format_time(trial.endTime),
         ]
     ]
     render.tabulate_or_csv(headers, values, args.csv)
 
-    headers, values = _workloads_tabulate(workloads, metrics=args.metrics)
+    headers, values = _workloads_tabulate(workloads, metrics=args.metrics, csv=args.csv)
 
     print()
     print("Workloads:")
@@ -203,70 +227,112 @@ def generate_support_bundle(args: Namespace) -> None:
         bundle_name = f"det-bundle-trial-{args.trial_id}-{dt}"
         fullpath = os.path.join(output_dir, f"{bundle_name}.tar.gz")
 
-        with tempfile.TemporaryDirectory() as temp_dir, tarfile.open(fullpath, "w:gz") as bundle:
-            trial_logs_filepath = write_trial_logs(args, temp_dir)
-            master_logs_filepath = write_master_logs(args, temp_dir)
-            api_experiment_filepath, api_trail_filepath = write_api_call(args, temp_dir)
-
-            bundle.add(
-                trial_logs_filepath,
-                arcname=os.path.join(bundle_name, os.path.basename(trial_logs_filepath)),
-            )
-            bundle.add(
-                master_logs_filepath,
-                arcname=os.path.join(bundle_name, os.path.basename(master_logs_filepath)),
-            )
-            bundle.add(
-                api_trail_filepath,
-                arcname=os.path.join(bundle_name, os.path.basename(api_trail_filepath)),
-            )
-            bundle.add(
-                api_experiment_filepath,
-                arcname=os.path.join(bundle_name, os.path.basename(api_experiment_filepath)),
-            )
-
-            print(f"bundle path: {fullpath}")
+        try:
+            write_bundle(args, fullpath, bundle_name)
+        except BaseException:
+            # Don't leave a truncated bundle behind if a fetch failed or the user interrupted us.
+            if os.path.exists(fullpath):
+                os.remove(fullpath)
+            raise
+
+        print(f"bundle path: {fullpath}")
 
     except FileNotFoundError:
         print("Could not create the bundle because the output_dir provived was not found.")
 
 
-def write_trial_logs(args: Namespace, temp_dir: str) -> str:
+def write_bundle(args: Namespace, fullpath: str, bundle_name: str) -> None:
+    # The experiment lookup needs the trial, so fetch that first; everything else can overlap.
     session = cli.setup_session(args)
-    trial_logs = api.trial_logs(session, args.trial_id)
-    file_path = os.path.join(temp_dir, "trial_logs.txt")
-    with open(file_path, "w") as f:
-        for log in trial_logs:
-            f.write(log.message)
-
-    return file_path
-
-
-def write_master_logs(args: Namespace, temp_dir: str) -> str:
-    responses = bindings.get_MasterLogs(cli.setup_session(args))
-    file_path = os.path.join(temp_dir, "master_logs.txt")
-    with open(file_path, "w") as f:
-        for response in responses:
-            f.write(format_log_entry(response.logEntry) + "\n")
-    return file_path
-
-
-def write_api_call(args: Namespace, temp_dir: str) -> Tuple[str, str]:
-    api_experiment_filepath = os.path.join(temp_dir, "api_experiment_call.json")
-    api_trial_filepath = os.path.join(temp_dir, "api_trial_call.json")
-
-    trial_obj = bindings.get_GetTrial(cli.setup_session(args), trialId=args.trial_id).trial
-    experiment_id = trial_obj.experimentId
-    exp_obj = bindings.get_GetExperiment(cli.setup_session(args), experimentId=experiment_id)
-
-    create_json_file_in_dir(exp_obj.to_json(), api_experiment_filepath)
-    create_json_file_in_dir(trial_obj.to_json(), api_trial_filepath)
-    return api_experiment_filepath, api_trial_filepath
+    trial_obj = bindings.get_GetTrial(session, trialId=args.trial_id).trial
 
+    # Logs can be arbitrarily long, so only keep them in memory while they are small. Once they
+    # spill to disk, buffer the many per-line writes into large ones.
+    trial_logs = tempfile.SpooledTemporaryFile(
+        max_size=BUNDLE_SPOOL_MAX_SIZE, buffering=BUNDLE_WRITE_BUFFER_SIZE
+    )
+    master_logs = tempfile.SpooledTemporaryFile(
+        max_size=BUNDLE_SPOOL_MAX_SIZE, buffering=BUNDLE_WRITE_BUFFER_SIZE
+    )
 
-def create_json_file_in_dir(content: Any, file_path: str) -> None:
-    with open(file_path, "w") as f:
-        json.dump(content, f)
+    experiment = io.BytesIO()
+
+    # gzip emits many small writes; batch them into large writes to the output file.
+    with trial_logs, master_logs, open(fullpath, "wb", buffering=BUNDLE_WRITE_BUFFER_SIZE) as f:
+        with tarfile.open(fileobj=f, mode="w:gz", compresslevel=BUNDLE_COMPRESSLEVEL) as bundle:
+            # The remaining fetches are independent, so their round trips can overlap. They
+            # all use the session created above, which gives each worker thread its own
+            # connections.
+            stop = threading.Event()
+            with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+                members: Dict["concurrent.futures.Future[None]", Tuple[str, IO[bytes]]] = {
+                    executor.submit(write_experiment, session, trial_obj, experiment): (
+                        "api_experiment_call.json",
+                        experiment,
+                    ),
+                    executor.submit(write_trial_logs, session, trial_obj, trial_logs, stop): (
+                        "trial_logs.txt",
+                        trial_logs,
+                    ),
+                    executor.submit(write_master_logs, session, master_logs, stop): (
+                        "master_logs.txt",
+                        master_logs,
+                    ),
+                }
+                try:
+                    # Compress whatever is ready while the rest is still being fetched. Members
+                    # need their size up front, so each one is added once it is fully fetched.
+                    add_json_member(
+                        bundle,
+                        os.path.join(bundle_name, "api_trial_call.json"),
+                        trial_obj.to_json(),
+                    )
+                    for future in concurrent.futures.as_completed(members):
+                        future.result()
+                        name, buf = members[future]
+                        add_bundle_member(bundle, os.path.join(bundle_name, name), buf, buf.tell())
+                except BaseException:
+                    # Leaving the executor waits for its workers, so make any log streams still
+                    # running stop at their next line rather than download to the end.
+                    stop.set()
+                    raise
+
+
+def add_bundle_member(bundle: tarfile.TarFile, arcname: str, buf: IO[bytes], size: int) -> None:
+    """Add the first size bytes of buf to the bundle, without staging them on disk."""
+    info = tarfile.TarInfo(arcname)
+    info.size = size
+    info.mtime = int(time.time())
+    buf.seek(0)
+    bundle.addfile(info, buf)
+
+
+def add_json_member(bundle: tarfile.TarFile, arcname: str, content: Any) -> None:
+    data = json.dumps(content).encode()
+    add_bundle_member(bundle, arcname, io.BytesIO(data), len(data))
+
+
+def write_experiment(session: api.Session, trial: bindings.trialv1Trial, f: IO[bytes]) -> None:
+    resp = bindings.get_GetExperiment(session, experimentId=trial.experimentId)
+    f.write(json.dumps(resp.to_json()).encode())
+
+
+def write_trial_logs(
+    session: api.Session, trial: bindings.trialv1Trial, f: IO[bytes], stop: threading.Event
+) -> None:
+    trial_logs = api.trial_logs(session, trial.id)
+    for log in trial_logs:
+        if stop.is_set():
+            return
+        f.write(log.message.encode())
+
+
+def write_master_logs(session: api.Session, f: IO[bytes], stop: threading.Event) -> None:
+    responses = bindings.get_MasterLogs(session)
+    for response in responses:
+        if stop.is_set():
+            return
+        f.write((format_log_entry(response.logEntry) + "\n").encode())
 
 
 logs_args_description = [
@@ -403,7 +469,7 @@ args_description = [
                     ),
                     Arg(
                         "--smaller-is-better",
-                        type=lambda s: bool(distutils.util.strtobool(s)),
+                        type=util.strtobool,
                         default=None,
                         help="The sort order for metrics when using --best with --sort-by. For "
                         "example, 'accuracy' would require passing '--smaller-is-better false'. If "
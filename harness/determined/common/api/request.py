@@ -87,6 +87,7 @@ def do_request(
     stream: bool = False,
     timeout: Optional[Union[Tuple, float]] = None,
     max_retries: Optional[urllib3.util.retry.Retry] = None,
+    session: Optional[requests.Session] = None,
 ) -> requests.Response:
     if headers is None:
         h: Dict[str, str] = {}
@@ -140,6 +141,7 @@ def do_request(
             timeout=timeout,
             server_hostname=cert.name if cert else None,
             max_retries=max_retries,
+            session=session,
         )
     except requests.exceptions.SSLError:
         raise
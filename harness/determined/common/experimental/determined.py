@@ -1,7 +1,7 @@
 import logging
 import pathlib
 import warnings
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
 
 import determined as det
 from determined.common import api, context, util, yaml
@@ -99,12 +99,21 @@ class Determined:
         return self._from_bindings(resp.user)
 
     def get_user_by_name(self, user_name: str) -> user.User:
-        resp = bindings.get_GetUserByUsername(session=self._session, username=user_name)
-        return self._from_bindings(resp.user)
+        auth = self._session._auth
+        assert auth
+        key = ("get_user_by_name", self._master, auth.get_session_token(), user_name)
+        raw = user.cached_user(
+            key,
+            lambda: bindings.get_GetUserByUsername(session=self._session, username=user_name).user,
+        )
+        return self._from_bindings(raw)
 
     def whoami(self) -> user.User:
-        resp = bindings.get_GetMe(self._session)
-        return self._from_bindings(resp.user)
+        auth = self._session._auth
+        assert auth
+        key = ("whoami", self._master, auth.get_session_token())
+        raw = user.cached_user(key, lambda: bindings.get_GetMe(self._session).user)
+        return self._from_bindings(raw)
 
     def get_session_username(self) -> str:
         auth = self._session._auth
@@ -134,6 +143,18 @@ class Determined:
             users.append(user_obj)
         return users
 
+    def iter_users(self, page_size: int = 500) -> Iterator[user.User]:
+        """
+        Yield every user, fetching them from the master ``page_size`` users at a time.
+        """
+
+        def get_with_offset(offset: int) -> bindings.v1GetUsersResponse:
+            return bindings.get_GetUsers(self._session, limit=page_size, offset=offset)
+
+        for resp in api.read_paginated(get_with_offset):
+            for user_b in resp.users or []:
+                yield self._from_bindings(user_b)
+
     def create_experiment(
         self,
         config: Union[str, pathlib.Path, Dict],
@@ -1,10 +1,88 @@
-from typing import Optional
+import collections
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional, Tuple
 
 from determined.common import api
 from determined.common.api import bindings
 
 
+class _TTLCache:
+    """
+    A small thread-safe LRU cache whose entries expire a fixed number of seconds after being set.
+    """
+
+    def __init__(self, ttl: float, maxsize: int) -> None:
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        # Ordered from least to most recently used.
+        self._entries: "collections.OrderedDict[Hashable, Tuple[float, Any]]" = (
+            collections.OrderedDict()
+        )
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expiry, value = entry
+            if time.monotonic() >= expiry:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            now = time.monotonic()
+            # Entries are ordered by use rather than by expiry, so check them all.
+            for k in [k for k, (expiry, _) in self._entries.items() if now >= expiry]:
+                del self._entries[k]
+            self._entries[key] = (now + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Raw users looked up by Determined.whoami() and Determined.get_user_by_name(). Any change to a
+# user made through User evicts them all, so only changes made elsewhere can go unseen, and only
+# for up to a minute.
+_user_cache = _TTLCache(ttl=60, maxsize=1024)
+
+
+def cached_user(key: Hashable, fetch: Callable[[], bindings.v1User]) -> bindings.v1User:
+    """
+    Return the raw user cached under key, calling fetch() to look it up when it is missing or more
+    than a minute old. The key must identify the master and token that fetch() uses.
+    """
+    raw: Optional[bindings.v1User] = _user_cache.get(key)
+    if raw is None:
+        raw = fetch()
+        _user_cache.set(key, raw)
+    return raw
+
+
 class User:
+    # Admin tools may hold many users at once, e.g. from Determined.list_users().
+    __slots__ = (
+        "username",
+        "admin",
+        "user_id",
+        "active",
+        "remote",
+        "agent_uid",
+        "agent_gid",
+        "agent_user",
+        "agent_group",
+        "_session",
+        "display_name",
+    )
+
     def __init__(
         self,
         user_id: int,
@@ -47,31 +125,26 @@ class User:
             self.agent_user = raw.agentUserGroup.agentUser
             self.agent_group = raw.agentUserGroup.agentGroup
 
-    def rename(self, new_username: str) -> None:
-        patch_user = bindings.v1PatchUser(username=new_username)
+    def _patch(self, patch_user: bindings.v1PatchUser) -> None:
         resp = bindings.patch_PatchUser(self._session, body=patch_user, userId=self.user_id)
+        _user_cache.invalidate()
         self._reload(resp.user)
 
+    def rename(self, new_username: str) -> None:
+        self._patch(bindings.v1PatchUser(username=new_username))
+
     def activate(self) -> None:
-        patch_user = bindings.v1PatchUser(active=True)
-        resp = bindings.patch_PatchUser(self._session, body=patch_user, userId=self.user_id)
-        self._reload(resp.user)
+        self._patch(bindings.v1PatchUser(active=True))
 
     def deactivate(self) -> None:
-        patch_user = bindings.v1PatchUser(active=False)
-        resp = bindings.patch_PatchUser(self._session, body=patch_user, userId=self.user_id)
-        self._reload(resp.user)
+        self._patch(bindings.v1PatchUser(active=False))
 
     def change_display_name(self, display_name: str) -> None:
-        patch_user = bindings.v1PatchUser(displayName=display_name)
-        resp = bindings.patch_PatchUser(self._session, body=patch_user, userId=self.user_id)
-        self._reload(resp.user)
+        self._patch(bindings.v1PatchUser(displayName=display_name))
 
     def change_password(self, new_password: str) -> None:
         new_password = api.salt_and_hash(new_password)
-        patch_user = bindings.v1PatchUser(password=new_password, isHashed=True)
-        resp = bindings.patch_PatchUser(self._session, body=patch_user, userId=self.user_id)
-        self._reload(resp.user)
+        self._patch(bindings.v1PatchUser(password=new_password, isHashed=True))
 
     def link_with_agent(
         self,
@@ -86,6 +159,4 @@ class User:
             agentUid=agent_uid,
             agentUser=agent_user,
         )
-        patch_user = bindings.v1PatchUser(agentUserGroup=v1agent_user_group)
-        resp = bindings.patch_PatchUser(self._session, body=patch_user, userId=self.user_id)
-        self._reload(resp.user)
+        self._patch(bindings.v1PatchUser(agentUserGroup=v1agent_user_group))
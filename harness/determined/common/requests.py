@@ -37,6 +37,10 @@ class Session(requests.sessions.Session):
 def request(method: str, url: str, **kwargs: Any) -> requests.Response:
     server_hostname = kwargs.pop("server_hostname", None)
     max_retries = kwargs.pop("max_retries", None)
+    session: Optional[requests.Session] = kwargs.pop("session", None)
+    if session is not None:
+        # A caller-provided Session is already configured with its server name and retries.
+        return session.request(method=method, url=url, **kwargs)
     with Session(server_hostname, max_retries) as session:
         out = session.request(method=method, url=url, **kwargs)  # type: requests.Response
         return out
@@ -61,6 +61,20 @@ def sizeof_fmt(val: Union[int, float]) -> str:
     return "%.1f%sB" % (val, "Y")
 
 
+_TRUTH_VALUES = {
+    **dict.fromkeys(("y", "yes", "t", "true", "on", "1"), True),
+    **dict.fromkeys(("n", "no", "f", "false", "off", "0"), False),
+}
+
+
+def strtobool(val: str) -> bool:
+    """Parse a truth value the way the deprecated distutils.util.strtobool() does."""
+    try:
+        return _TRUTH_VALUES[val.lower()]
+    except KeyError:
+        raise ValueError(f"invalid truth value {val!r}") from None
+
+
 def get_default_master_address() -> str:
     return os.environ.get("DET_MASTER", os.environ.get("DET_MASTER_ADDR", "localhost:8080"))
 
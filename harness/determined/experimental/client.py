@@ -47,7 +47,7 @@ import functools
 import logging
 import pathlib
 import warnings
-from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
 
 from determined.common.api import Session  # noqa: F401
 from determined.common.experimental.checkpoint import (  # noqa: F401
@@ -268,6 +268,19 @@ def list_users() -> Sequence[User]:
     return _determined.list_users()
 
 
+@_require_singleton
+def iter_users(page_size: int = 500) -> Iterator[User]:
+    """
+    Iterate over the :class:`~determined.experimental.client.User` of all Users, fetching them
+    from the master one page at a time.
+
+    Arguments:
+        page_size (int, optional): The number of users to fetch per request. (default: ``500``)
+    """
+    assert _determined is not None
+    return _determined.iter_users(page_size)
+
+
 @_require_singleton
 def get_trial(trial_id: int) -> TrialReference:
     """
@@ -0,0 +1,233 @@
+import csv
+import io
+import json
+import tarfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+from unittest import mock
+
+import pytest
+import requests_mock
+
+import determined.cli.cli as cli
+from determined.common import constants
+from tests.common import api_server
+
+mock_trial = {
+    "experimentId": 7,
+    "hparams": {"lr": 0.1, "layers": [1, 2]},
+    "id": 3,
+    "restarts": 0,
+    "startTime": "2023-01-02T03:04:05Z",
+    "endTime": "2023-01-02T04:04:05Z",
+    "state": "STATE_COMPLETED",
+    "totalBatchesProcessed": 200,
+}
+
+
+def mock_metrics(batches: int, loss: float) -> Dict[str, Any]:
+    return {
+        "endTime": "2023-01-02T03:10:00Z",
+        "metrics": {"avgMetrics": {"loss": loss}},
+        "numInputs": 32,
+        "totalBatches": batches,
+    }
+
+
+mock_workloads = [
+    {"training": mock_metrics(100, 0.5)},
+    {"validation": mock_metrics(100, 0.25)},
+    {
+        "checkpoint": {
+            "endTime": "2023-01-02T03:10:00Z",
+            "metadata": {"framework": "torch", "steps": 100},
+            "state": "STATE_COMPLETED",
+            "totalBatches": 100,
+            "uuid": "a1b2c3",
+        }
+    },
+]
+
+
+def mock_login(requests_mock: requests_mock.Mocker) -> None:
+    requests_mock.get("/info", status_code=200, json={"version": "1.0"})
+    requests_mock.get(
+        "/api/v1/me", status_code=200, json={"username": constants.DEFAULT_DETERMINED_USER}
+    )
+    fake_user = {"username": "fakeuser", "admin": True, "active": True}
+    requests_mock.post(
+        "/api/v1/auth/login", status_code=200, json={"token": "fake-token", "user": fake_user}
+    )
+
+
+def read_csv_tables(out: str) -> List[List[List[str]]]:
+    # describe prints the trial table, a blank line, "Workloads:", then the workloads table.
+    trial_csv, workloads_csv = out.split("\nWorkloads:\n")
+    return [list(csv.reader(io.StringIO(t.strip() + "\n"))) for t in (trial_csv, workloads_csv)]
+
+
+def test_describe_csv(requests_mock: requests_mock.Mocker, capsys: pytest.CaptureFixture) -> None:
+    mock_login(requests_mock)
+    requests_mock.get("/api/v1/trials/3", status_code=200, json={"trial": mock_trial})
+    requests_mock.get(
+        "/api/v1/trials/3/workloads",
+        status_code=200,
+        json={
+            "workloads": mock_workloads,
+            "pagination": {"offset": 0, "limit": 0, "startIndex": 0, "endIndex": 3, "total": 3},
+        },
+    )
+
+    cli.main(["trial", "describe", "3", "--csv", "--metrics"])
+
+    trial_rows, workload_rows = read_csv_tables(capsys.readouterr().out)
+    assert trial_rows == [
+        ["Experiment ID", "State", "H-Params", "Started", "Ended"],
+        [
+            "7",
+            "experimentv1State.STATE_COMPLETED",
+            '{"lr":0.1,"layers":[1,2]}',
+            "2023-01-02 03:04:05+0000",
+            "2023-01-02 04:04:05+0000",
+        ],
+    ]
+    # CSV cells hold compact JSON, and every row has one cell per header.
+    assert workload_rows == [
+        [
+            "# of Batches",
+            "Report Time",
+            "Checkpoint",
+            "Checkpoint UUID",
+            "Checkpoint Metadata",
+            "Validation Metrics",
+            "Workload Metrics",
+        ],
+        [
+            "100",
+            "2023-01-02 03:10:00+0000",
+            "",
+            "",
+            "",
+            "",
+            '{"avgMetrics":{"loss":0.5},"batchMetrics":null}',
+        ],
+        [
+            "100",
+            "2023-01-02 03:10:00+0000",
+            "",
+            "",
+            "",
+            '{"avgMetrics":{"loss":0.25},"batchMetrics":null}',
+            '{"avgMetrics":{"loss":0.25},"batchMetrics":null}',
+        ],
+        [
+            "100",
+            "2023-01-02 03:10:00+0000",
+            "COMPLETED",
+            "a1b2c3",
+            '{"framework":"torch","steps":100}',
+            "",
+            "",
+        ],
+    ]
+
+
+def mock_log_stream(entries: List[Dict[str, Any]]) -> str:
+    return "".join(json.dumps({"result": e}) + "\n" for e in entries)
+
+
+def mock_support_bundle(requests_mock: requests_mock.Mocker) -> Dict[str, Any]:
+    mock_login(requests_mock)
+    requests_mock.get("/api/v1/trials/3", status_code=200, json={"trial": mock_trial})
+    exp = api_server.sample_get_experiment()
+    exp.experiment.id = 7
+    requests_mock.get("/api/v1/experiments/7", status_code=200, json=exp.to_json())
+    trial_logs = [
+        {
+            "id": str(i),
+            "level": "LOG_LEVEL_INFO",
+            "message": f"trial log {i}\n",
+            "timestamp": "2023-01-02T03:04:05Z",
+            "trialId": 3,
+        }
+        for i in range(3)
+    ]
+    requests_mock.get("/api/v1/trials/3/logs", status_code=200, text=mock_log_stream(trial_logs))
+    master_logs = [
+        {
+            "logEntry": {
+                "id": i,
+                "level": "LOG_LEVEL_INFO",
+                "message": f"master log {i}",
+                "timestamp": "2023-01-02T03:04:05Z",
+            }
+        }
+        for i in range(2)
+    ]
+    requests_mock.get("/api/v1/master/logs", status_code=200, text=mock_log_stream(master_logs))
+    return exp.to_json()
+
+
+def test_support_bundle(requests_mock: requests_mock.Mocker, tmp_path: Path) -> None:
+    exp_json = mock_support_bundle(requests_mock)
+
+    cli.main(["trial", "support-bundle", "3", "-o", str(tmp_path)])
+
+    (bundle_path,) = tmp_path.iterdir()
+    bundle_name = bundle_path.name[: -len(".tar.gz")]
+    assert bundle_name.startswith("det-bundle-trial-3-")
+    members: Dict[str, bytes] = {}
+    with tarfile.open(bundle_path, "r:gz") as bundle:
+        for member in bundle.getmembers():
+            f = bundle.extractfile(member)
+            assert f is not None
+            members[Path(member.name).relative_to(bundle_name).as_posix()] = f.read()
+
+    assert sorted(members) == [
+        "api_experiment_call.json",
+        "api_trial_call.json",
+        "master_logs.txt",
+        "trial_logs.txt",
+    ]
+    assert json.loads(members["api_trial_call.json"])["id"] == 3
+    assert json.loads(members["api_experiment_call.json"]) == exp_json
+    assert members["trial_logs.txt"] == b"trial log 0\ntrial log 1\ntrial log 2\n"
+    assert members["master_logs.txt"] == (
+        b"2023-01-02T03:04:05Z [INFO]: master log 0\n2023-01-02T03:04:05Z [INFO]: master log 1\n"
+    )
+
+
+def slow_trial_logs(session: Any, trial_id: int) -> Iterator[Any]:
+    # Streams for about five seconds unless the reader stops early.
+    for i in range(100):
+        time.sleep(0.05)
+        yield mock.Mock(message=f"trial log {i}\n")
+
+
+@mock.patch("determined.common.api.trial_logs", slow_trial_logs)
+def test_support_bundle_fails_promptly(requests_mock: requests_mock.Mocker, tmp_path: Path) -> None:
+    mock_support_bundle(requests_mock)
+    requests_mock.get("/api/v1/master/logs", status_code=500, json={"error": "boom"})
+
+    start = time.monotonic()
+    with pytest.raises(SystemExit):
+        cli.main(["trial", "support-bundle", "3", "-o", str(tmp_path)])
+
+    # The failed master logs fetch stops the trial logs stream rather than waiting it out.
+    assert time.monotonic() - start < 2
+
+
+@mock.patch("determined.common.api.trial_logs", slow_trial_logs)
+def test_support_bundle_removed_on_failure(
+    requests_mock: requests_mock.Mocker, tmp_path: Path
+) -> None:
+    mock_support_bundle(requests_mock)
+    requests_mock.get("/api/v1/master/logs", status_code=500, json={"error": "boom"})
+
+    with pytest.raises(SystemExit):
+        cli.main(["trial", "support-bundle", "3", "-o", str(tmp_path)])
+
+    # The partial bundle is removed once the trial logs stream, still running when the master
+    # logs failed, has stopped.
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,146 @@
+import contextlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional
+from unittest import mock
+
+import determined.common.requests
+from determined.common import api
+from determined.common.api import certs
+
+
+@contextlib.contextmanager
+def run_keepalive_server() -> Iterator[Dict[str, Any]]:
+    """Serve empty JSON over HTTP/1.1 keep-alive, counting connections and recording cookies."""
+    lock = threading.Lock()
+    state: Dict[str, Any] = {"connections": 0, "cookies": []}
+
+    class RequestHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self) -> None:
+            super().setup()
+            with lock:
+                state["connections"] += 1
+
+        def do_GET(self) -> None:
+            with lock:
+                state["cookies"].append(self.headers.get("Cookie"))
+            body = b"{}"
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            # Like the master's login response.
+            self.send_header("Set-Cookie", "auth=secret; Path=/")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("localhost", 0), RequestHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["master"] = f"http://localhost:{server.server_address[1]}"
+    try:
+        yield state
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def make_session(master: str, cert: Optional[certs.Cert] = None) -> api.Session:
+    return api.Session(master, None, None, cert)
+
+
+def server_hostname(session: api.Session) -> Optional[str]:
+    adapter = session._http_session().get_adapter("https://localhost")
+    assert isinstance(adapter, determined.common.requests.HTTPAdapter)
+    return adapter.server_hostname
+
+
+def test_session_reuses_connections() -> None:
+    with run_keepalive_server() as state:
+        session = make_session(state["master"])
+        for _ in range(5):
+            assert session.get("/api/v1/me").json() == {}
+        assert state["connections"] == 1
+
+
+def test_session_rejects_cookies() -> None:
+    with run_keepalive_server() as state:
+        session = make_session(state["master"])
+        for _ in range(3):
+            session.get("/api/v1/me")
+        assert state["cookies"] == [None, None, None]
+
+
+def test_session_close() -> None:
+    with run_keepalive_server() as state:
+        with make_session(state["master"]) as session:
+            session.get("/api/v1/me")
+            session.get("/api/v1/me")
+        assert state["connections"] == 1
+
+        # A closed session reconnects on its next request.
+        session.get("/api/v1/me")
+        assert state["connections"] == 2
+
+
+def test_session_per_thread() -> None:
+    num_threads = 4
+    with run_keepalive_server() as state:
+        session = make_session(state["master"])
+        barrier = threading.Barrier(num_threads)
+        http_sessions: List[Any] = []
+        errors: List[BaseException] = []
+
+        def run() -> None:
+            try:
+                barrier.wait()
+                for _ in range(5):
+                    assert session.get("/api/v1/me").json() == {}
+                http_sessions.append(session._http_session())
+            except BaseException as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run) for _ in range(num_threads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert len({id(s) for s in http_sessions}) == num_threads
+        assert state["connections"] == num_threads
+
+        # close() reaches the connections of every thread, not just the calling one.
+        session.close()
+        for s in http_sessions:
+            for adapter in s.adapters.values():
+                assert len(adapter.poolmanager.pools) == 0
+
+
+def test_session_rebuilt_after_fork() -> None:
+    session = make_session("http://localhost:8080")
+    http_session = session._http_session()
+    assert session._http_session() is http_session
+
+    with mock.patch("os.getpid", return_value=os.getpid() + 1):
+        assert session._http_session() is not http_session
+
+
+def test_session_rebuilt_on_cert_name_change() -> None:
+    session = make_session("https://localhost:8080")
+    with mock.patch.object(certs, "cli_cert", certs.Cert(name="master-a")):
+        assert server_hostname(session) == "master-a"
+    with mock.patch.object(certs, "cli_cert", certs.Cert(name="master-b")):
+        assert server_hostname(session) == "master-b"
+
+    # An explicit cert takes precedence over the CLI's.
+    session = make_session("https://localhost:8080", cert=certs.Cert(name="master-c"))
+    with mock.patch.object(certs, "cli_cert", certs.Cert(name="master-a")):
+        assert server_hostname(session) == "master-c"
@@ -0,0 +1,137 @@
+from typing import Any, Iterator
+from unittest import mock
+
+import pytest
+
+from determined.common.api import bindings
+from determined.common.experimental import Determined, user
+
+
+def make_user(user_id: int, username: str) -> bindings.v1User:
+    return bindings.v1User(id=user_id, username=username, admin=False, active=True)
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache() -> Iterator[None]:
+    user._user_cache.invalidate()
+    yield
+    user._user_cache.invalidate()
+
+
+@pytest.fixture
+def client() -> Iterator[Determined]:
+    with mock.patch("determined.common.api.authentication.Authentication") as auth_mock:
+        auth_mock.return_value.get_session_token.return_value = "token1"
+        yield Determined(master="http://localhost:8080")
+
+
+@mock.patch("determined.common.api.bindings.get_GetUserByUsername")
+def test_get_user_by_name_cached(get_mock: mock.MagicMock, client: Determined) -> None:
+    get_mock.side_effect = lambda session, username: bindings.v1GetUserByUsernameResponse(
+        user=make_user(len(username), username)
+    )
+
+    assert client.get_user_by_name("alice").user_id == 5
+    assert client.get_user_by_name("alice").user_id == 5
+    assert get_mock.call_count == 1
+
+    assert client.get_user_by_name("bob").username == "bob"
+    assert get_mock.call_count == 2
+
+
+@mock.patch("determined.common.api.bindings.patch_PatchUser")
+@mock.patch("determined.common.api.bindings.get_GetUserByUsername")
+def test_get_user_by_name_invalidated_by_rename(
+    get_mock: mock.MagicMock, patch_mock: mock.MagicMock, client: Determined
+) -> None:
+    get_mock.return_value = bindings.v1GetUserByUsernameResponse(user=make_user(1, "alice"))
+    patch_mock.return_value = bindings.v1PatchUserResponse(user=make_user(1, "carol"))
+
+    client.get_user_by_name("alice").rename("carol")
+    client.get_user_by_name("alice")
+    assert get_mock.call_count == 2
+
+
+def test_user_cache_evicts_least_recently_used() -> None:
+    cache = user._TTLCache(ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_user_cache_sweeps_expired_entries() -> None:
+    cache = user._TTLCache(ttl=60, maxsize=10)
+    with mock.patch("time.monotonic", return_value=0):
+        cache.set("a", 1)
+    with mock.patch("time.monotonic", return_value=60):
+        cache.set("b", 2)
+        # "a" expired and was dropped by the set(), without ever being read again.
+        assert list(cache._entries) == ["b"]
+
+
+@mock.patch("determined.common.api.bindings.get_GetMe")
+def test_whoami_cached(get_mock: mock.MagicMock, client: Determined) -> None:
+    get_mock.return_value = bindings.v1GetMeResponse(user=make_user(1, "alice"))
+
+    with mock.patch("time.monotonic", return_value=0):
+        assert client.whoami().username == "alice"
+    with mock.patch("time.monotonic", return_value=59):
+        assert client.whoami().username == "alice"
+    assert get_mock.call_count == 1
+
+    # Cached users expire after a minute.
+    with mock.patch("time.monotonic", return_value=60):
+        client.whoami()
+    assert get_mock.call_count == 2
+
+
+@mock.patch("determined.common.api.bindings.patch_PatchUser")
+@mock.patch("determined.common.api.bindings.get_GetMe")
+def test_whoami_invalidated_by_patch(
+    get_mock: mock.MagicMock, patch_mock: mock.MagicMock, client: Determined
+) -> None:
+    get_mock.return_value = bindings.v1GetMeResponse(user=make_user(1, "alice"))
+    patch_mock.return_value = bindings.v1PatchUserResponse(user=make_user(1, "alice"))
+
+    me = client.whoami()
+    client.whoami()
+    assert get_mock.call_count == 1
+
+    me.change_display_name("Alice")
+    client.whoami()
+    assert get_mock.call_count == 2
+
+
+@mock.patch("determined.common.api.bindings.get_GetUsers")
+def test_iter_users(get_mock: mock.MagicMock, client: Determined) -> None:
+    total = 5
+
+    def get_users(session: Any, limit: int, offset: int) -> bindings.v1GetUsersResponse:
+        end = min(offset + limit, total)
+        return bindings.v1GetUsersResponse(
+            users=[make_user(i, f"user{i}") for i in range(offset, end)],
+            pagination=bindings.v1Pagination(
+                offset=offset, limit=limit, startIndex=offset, endIndex=end, total=total
+            ),
+        )
+
+    get_mock.side_effect = get_users
+
+    assert [u.username for u in client.iter_users(page_size=2)] == [
+        f"user{i}" for i in range(total)
+    ]
+    assert [c.kwargs["offset"] for c in get_mock.call_args_list] == [0, 2, 4]
+    assert all(c.kwargs["limit"] == 2 for c in get_mock.call_args_list)
+
+    # Pages are only fetched as they are needed.
+    get_mock.reset_mock()
+    users = client.iter_users(page_size=2)
+    assert next(users).username == "user0"
+    assert next(users).username == "user1"
+    assert [c.kwargs["offset"] for c in get_mock.call_args_list] == [0]
+    assert next(users).username == "user2"
+    assert [c.kwargs["offset"] for c in get_mock.call_args_list] == [0, 2]
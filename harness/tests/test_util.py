@@ -24,6 +24,15 @@ def test_sizeof_fmt() -> None:
     assert det.common.util.sizeof_fmt(36) == "36.0B"
 
 
+def test_strtobool() -> None:
+    for val in ("y", "Yes", "t", "TRUE", "on", "1"):
+        assert det.common.util.strtobool(val) is True
+    for val in ("n", "No", "f", "FALSE", "off", "0"):
+        assert det.common.util.strtobool(val) is False
+    with pytest.raises(ValueError):
+        det.common.util.strtobool("maybe")
+
+
 def test_calculate_batch_sizes() -> None:
     # Valid cases.
     psbs, gbs = det.util.calculate_batch_sizes({"global_batch_size": 1}, 1, "Trial")